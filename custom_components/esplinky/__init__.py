@@ -3,28 +3,43 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import Callable
 import logging
 import socket
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PORT
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_call_later
 
-from .linky_parser import parse_tic_frame
+from .linky_parser import MAX_FRAME_SIZE, parse_tic_frame
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "esplinky"
-EVENT_NEW_TIC_DATA = f"{DOMAIN}_new_data"
 PLATFORMS: list[str] = ["sensor"]
 
 # Default UDP port for Linky data
 DEFAULT_PORT = 8095
 
+# Kernel receive buffer requested for the UDP socket, to absorb bursts
+RECEIVE_BUFFER_SIZE = 262144
+
+# Identical consecutive frames are dispatched at most once per interval (seconds)
+FRAME_HEARTBEAT_INTERVAL = 60
+
+# Datagrams larger than this (bytes) are parsed in the executor so an abnormal
+# payload cannot stall the event loop: a clean 4 KiB frame parses in well under
+# a millisecond, but one full of corrupted lines logs warnings for each of them
+# and takes several
+EXECUTOR_PARSE_THRESHOLD = 1024
+
+# Datagrams kept waiting while an executor parse is in flight (oldest dropped first)
+PARSE_QUEUE_SIZE = 16
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ESPLinky from a config entry."""
     
@@ -67,8 +82,10 @@ class EsplinkyListener:
         self.entry = entry
         self.port = port
         self._transport = None
+        self._tic_callbacks: list[Callable[[dict[str, str]], None]] = []
         
-        self._device_info = DeviceInfo(
+        # Shared by all sensor entities of this entry
+        self.device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.entry_id)},
             name=f"ESPLinky (Port {port})", # <-- Updated name
             model="Linky TIC Listener",
@@ -80,9 +97,15 @@ class EsplinkyListener:
         loop = asyncio.get_event_loop()
         # Bind to 0.0.0.0 (all interfaces)
         self._transport, protocol = await loop.create_datagram_endpoint(
-            lambda: LinkyUDPProtocol(self.hass),
-            local_addr=('0.0.0.0', self.port)
+            lambda: LinkyUDPProtocol(self.hass, self._async_dispatch),
+            local_addr=('0.0.0.0', self.port),
         )
+
+        sock = self._transport.get_extra_info("socket")
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+        except OSError as err:
+            _LOGGER.debug("Could not set UDP receive buffer size: %s", err)
         _LOGGER.info("UDP listener started on port %s", self.port)
 
     async def async_stop(self) -> None:
@@ -91,12 +114,39 @@ class EsplinkyListener:
             self._transport.close()
             _LOGGER.info("UDP listener stopped on port %s", self.port)
 
+    @callback
+    def async_register_tic_callback(
+        self, tic_callback: Callable[[dict[str, str]], None]
+    ) -> CALLBACK_TYPE:
+        """Register a callback receiving parsed TIC data; returns a function to unregister it."""
+        self._tic_callbacks.append(tic_callback)
+
+        @callback
+        def _unregister() -> None:
+            self._tic_callbacks.remove(tic_callback)
+
+        return _unregister
+
+    @callback
+    def _async_dispatch(self, tic_data: dict[str, str]) -> None:
+        """Hand parsed TIC data to the registered callbacks."""
+        for tic_callback in self._tic_callbacks:
+            tic_callback(tic_data)
+
 class LinkyUDPProtocol(asyncio.DatagramProtocol):
     """Protocol to handle incoming UDP packets."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self, hass: HomeAssistant, dispatch: Callable[[dict[str, str]], None]
+    ) -> None:
         """Initialize the protocol."""
         self.hass = hass
+        self._dispatch = dispatch
+        self._last_datagram: bytes | None = None
+        self._last_tic_data: dict[str, str] | None = None
+        self._last_dispatch_time = 0.0
+        self._parse_task: asyncio.Task | None = None
+        self._parse_queue: deque[bytes] = deque(maxlen=PARSE_QUEUE_SIZE)
 
     def connection_made(self, transport: asyncio.BaseTransport) -> None:
         """Called when connection is made."""
@@ -104,17 +154,73 @@ class LinkyUDPProtocol(asyncio.DatagramProtocol):
 
     def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
         """Handle incoming UDP datagrams."""
-        ip, port = addr
-        _LOGGER.debug("Received datagram from %s:%s. Length: %d", ip, port, len(data))
-        
-        # Process the raw TIC frame
-        tic_data = parse_tic_frame(data)
+        # Skip building log arguments when the level is filtered out: this
+        # runs for every datagram
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            ip, port = addr
+            _LOGGER.debug("Received datagram from %s:%s. Length: %d", ip, port, len(data))
         
+        # A byte-identical repeat of the previous datagram parses to the same
+        # values: skip it until the next heartbeat is due
+        if (
+            data == self._last_datagram
+            and self.hass.loop.time() - self._last_dispatch_time < FRAME_HEARTBEAT_INTERVAL
+        ):
+            return
+        self._last_datagram = data
+
+        # Queue behind a parse in flight so values are always dispatched in
+        # arrival order: an older counter reading must never overwrite a newer one
+        if self._parse_task is not None:
+            self._parse_queue.append(data)
+            return
+
+        # Process the raw TIC frame (oversized datagrams are rejected by the
+        # parser right away, so only hand off the ones it will actually scan)
+        if EXECUTOR_PARSE_THRESHOLD < len(data) <= MAX_FRAME_SIZE:
+            self._parse_task = self.hass.async_create_task(self._async_parse_in_executor(data))
+            return
+
+        self._async_handle_tic_data(parse_tic_frame(data))
+
+    async def _async_parse_in_executor(self, data: bytes) -> None:
+        """Parse an oversized datagram off the event loop, then the ones queued meanwhile."""
+        try:
+            while True:
+                tic_data = await self.hass.async_add_executor_job(parse_tic_frame, data)
+                self._async_handle_tic_data(tic_data)
+                if not self._parse_queue:
+                    return
+                data = self._parse_queue.popleft()
+        finally:
+            # Never leave stale datagrams behind to be parsed after newer ones
+            self._parse_queue.clear()
+            self._parse_task = None
+
+    @callback
+    def _async_handle_tic_data(self, tic_data: dict[str, str]) -> None:
+        """Dispatch the values parsed from a datagram."""
         if tic_data:
-            _LOGGER.info("Successfully parsed and validated %d Linky values. Firing HA event.", len(tic_data))
+            # Drop frames whose values equal the last dispatched ones, but still
+            # let one through per heartbeat interval so sensors keep receiving
+            # data. Unlike the raw datagram check above, this also catches
+            # datagrams that differ only in lines the parser rejected.
+            now = self.hass.loop.time()
+            if (
+                tic_data == self._last_tic_data
+                and now - self._last_dispatch_time < FRAME_HEARTBEAT_INTERVAL
+            ):
+                _LOGGER.debug("Skipping TIC frame identical to the previous one")
+                return
+            self._last_tic_data = tic_data
+            self._last_dispatch_time = now
+
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("Successfully parsed and validated %d Linky values. Dispatching to sensors.", len(tic_data))
             
-            # Fire a Home Assistant event with the validated data
-            self.hass.bus.fire(EVENT_NEW_TIC_DATA, {"data": tic_data})
+            # Hand the validated data directly to the listener's callbacks,
+            # without going through the event bus or dispatcher
+            self._dispatch(tic_data)
         else:
             _LOGGER.warning("Received UDP packet but could not extract any valid Linky data. Checksum errors or incorrect format.")
 
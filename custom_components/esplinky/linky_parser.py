@@ -1,93 +1,125 @@
 """Utility to parse and validate a Linky TeleInformation Client (TIC) frame."""
 
+from collections.abc import Iterator
 import logging
+import re
 
 _LOGGER = logging.getLogger(__name__)
 
-def validate_checksum(line: str) -> bool:
-    """Validate the checksum of a single TIC data line with detailed troubleshooting."""
-    # A TIC line looks like: LABEL VALUE CHECKSUM
-    
-    # 1. Check basic line structure
-    if len(line) < 3:
-        _LOGGER.debug("Checksum validation failed: Line too short (%d chars): '%s'", len(line), repr(line))
+# Datagram size bounds: the shortest useful payload is a single "L V C" line,
+# while a full historic frame stays well under a kilobyte
+MIN_FRAME_SIZE = 5
+MAX_FRAME_SIZE = 4096
+
+# A historic mode TIC line: LABEL SP VALUE SP CHECKSUM. Only printable ASCII
+# is accepted: the checksum ignores bit 7, so it cannot catch bytes whose
+# parity bit leaked through (a 7E1 link read as 8N1).
+_TIC_LINE = re.compile(rb'([A-Z0-9]+) ([\x20-\x7e]+) ([\x20-\x7e])')
+
+# A line whose checksum is missing: LABEL SP VALUE
+_TIC_LINE_NO_CHECKSUM = re.compile(rb'([A-Z0-9]+) ([\x20-\x7e]+)')
+
+# Labels defined by the historic mode TIC specification, mapped to themselves
+# so parsed labels can be swapped for these canonical (interned) objects
+_KNOWN_LABELS = {
+    label: label
+    for label in (
+        "ADCO", "OPTARIF", "ISOUSC", "BASE", "HCHC", "HCHP",
+        "EJPHN", "EJPHPM", "BBRHCJB", "BBRHPJB", "BBRHCJW", "BBRHPJW",
+        "BBRHCJR", "BBRHPJR", "PEJP", "PTEC", "DEMAIN",
+        "IINST", "IINST1", "IINST2", "IINST3", "ADPS", "ADIR1", "ADIR2", "ADIR3",
+        "IMAX", "IMAX1", "IMAX2", "IMAX3", "PMAX", "PAPP", "HHPHC", "MOTDETAT", "PPOT",
+    )
+}
+
+# Labels whose value is still accepted when the line checksum is missing or
+# invalid (their values also get trailing dots removed)
+_ACCEPT_WITHOUT_CHECKSUM = frozenset(("PTEC", "OPTARIF"))
+
+# A non-empty line, without its CR/LF terminators. The STX (0x02) and ETX
+# (0x03) frame delimiters also end a line, so a datagram spanning a frame
+# boundary keeps the lines on both sides. Lines are not stripped: a space
+# (0x20) is a valid checksum character.
+_LINE_SPAN = re.compile(rb'[^\r\n\x02\x03]+')
+
+def calculate_checksum(data: bytes) -> int:
+    """Return the TIC checksum byte value for the LABEL SP VALUE part of a line."""
+    # Only the low 6 bits of the sum matter, and (a + b) & 0x3F equals
+    # ((a & 0x3F) + (b & 0x3F)) & 0x3F, so masking the plain byte sum once is
+    # exact: no per-byte lookup table or reduction is needed.
+    return (sum(data) & 0x3F) + 0x20
+
+def validate_checksum(line: bytes | memoryview) -> bool:
+    """Validate the checksum of a single TIC data line (LABEL SP VALUE SP CHECKSUM)."""
+    if len(line) < 3 or line[-2] != 0x20:
         return False
-    
+    # Checksum covers everything except the space and checksum (see
+    # calculate_checksum); subtract those two bytes instead of slicing them off
+    checksum_code = line[-1]
+    return ((sum(line) - checksum_code - 0x20) & 0x3F) + 0x20 == checksum_code
+
+def _log_checksum_failure(line: bytes) -> None:
+    """Log detailed troubleshooting information for a line that failed validation."""
     # Check if line has the expected format with space before checksum
-    if line[-2] != ' ':
+    if len(line) < 3 or line[-2] != 0x20:
         # Special handling for lines that might be truncated or malformed
         _LOGGER.warning(
             "Checksum validation failed: No space before checksum\n"
-            "  Line: '%s'\n"
+            "  Line: %s\n"
             "  Length: %d chars\n"
-            "  Last 5 chars: '%s'\n"
+            "  Last 5 chars: %s\n"
             "  ASCII codes of last 5 chars: %s\n"
             "  Expected format: 'LABEL VALUE CHECKSUM' (space before last char)",
-            line,
+            repr(line),
             len(line),
-            repr(line[-5:]) if len(line) >= 5 else repr(line),
-            [ord(c) for c in line[-5:]] if len(line) >= 5 else [ord(c) for c in line]
+            repr(line[-5:]),
+            list(line[-5:])
         )
-        return False
-        
-    # 2. Extract components for debugging
-    checksum_char = line[-1]
+        return
+
+    checksum_code = line[-1]
     data_to_sum = line[:-2]  # Everything except space and checksum
+    checksum_value = sum(data_to_sum)
+    expected_checksum_code = calculate_checksum(data_to_sum)
+
+    _LOGGER.warning(
+        "Checksum validation failed for TIC line: %s\n"
+        "  Data part: %s\n"
+        "  Data length: %d\n" 
+        "  Data ASCII codes: %s\n"
+        "  Sum of ASCII codes: %d (0x%X)\n"
+        "  Sum & 0x3F: %d (0x%02X)\n"
+        "  Expected checksum code: %d (0x%02X)\n"
+        "  Expected checksum char: '%s' (ASCII %d)\n"
+        "  Received checksum char: '%s' (ASCII %d)\n"
+        "  Difference: %d",
+        repr(line),
+        repr(data_to_sum),
+        len(data_to_sum),
+        list(data_to_sum),
+        checksum_value,
+        checksum_value,
+        checksum_value & 0x3F,
+        checksum_value & 0x3F,
+        expected_checksum_code,
+        expected_checksum_code,
+        chr(expected_checksum_code),
+        expected_checksum_code,
+        chr(checksum_code),
+        checksum_code,
+        checksum_code - expected_checksum_code
+    )
     
-    # 3. Calculate the sum of ASCII codes
-    checksum_value = sum(ord(char) for char in data_to_sum)
-    
-    # 4. Calculate expected checksum using TIC formula
-    expected_checksum_code = (checksum_value & 0x3F) + 0x20
-    expected_checksum = chr(expected_checksum_code)
-    
-    # 5. Compare checksums
-    is_valid = expected_checksum == checksum_char
+    # Additional analysis for common issues
+    if b'\r' in line or b'\n' in line:
+        _LOGGER.warning("Line contains CR/LF characters that may affect checksum calculation")
     
-    if not is_valid:
-        # Detailed troubleshooting information
-        _LOGGER.warning(
-            "Checksum validation failed for TIC line: '%s'\n"
-            "  Data part: '%s'\n"
-            "  Data length: %d\n" 
-            "  Data ASCII codes: %s\n"
-            "  Sum of ASCII codes: %d (0x%X)\n"
-            "  Sum & 0x3F: %d (0x%02X)\n"
-            "  Expected checksum code: %d (0x%02X)\n"
-            "  Expected checksum char: '%s' (ASCII %d)\n"
-            "  Received checksum char: '%s' (ASCII %d)\n"
-            "  Difference: %d",
-            repr(line),
-            repr(data_to_sum),
-            len(data_to_sum),
-            [ord(c) for c in data_to_sum],
-            checksum_value,
-            checksum_value,
-            checksum_value & 0x3F,
-            checksum_value & 0x3F,
-            expected_checksum_code,
-            expected_checksum_code,
-            expected_checksum,
-            ord(expected_checksum),
-            checksum_char,
-            ord(checksum_char),
-            ord(checksum_char) - ord(expected_checksum)
-        )
-        
-        # Additional analysis for common issues
-        if '\r' in line or '\n' in line:
-            _LOGGER.warning("Line contains CR/LF characters that may affect checksum calculation")
+    if len(data_to_sum.split()) < 2:
+        _LOGGER.warning("Line doesn't appear to have LABEL VALUE structure")
         
-        if len(data_to_sum.split()) < 2:
-            _LOGGER.warning("Line doesn't appear to have LABEL VALUE structure")
-            
-        # Check if it might be a different TIC format (Standard mode vs Historic mode)
-        if '\t' in data_to_sum:
-            _LOGGER.warning("Line contains TAB characters - might be Standard mode TIC format")
-    else:
-        _LOGGER.debug("Checksum validation passed for line: '%s'", repr(line))
-    
-    return is_valid
+    # Check if it might be a different TIC format (Standard mode vs Historic mode)
+    if b'\t' in data_to_sum:
+        _LOGGER.warning("Line contains TAB characters - might be Standard mode TIC format")
 
 def parse_tic_frame(raw_frame: bytes) -> dict[str, str]:
     """
@@ -99,127 +131,147 @@ def parse_tic_frame(raw_frame: bytes) -> dict[str, str]:
     Returns:
         A dictionary mapping validated Linky labels (e.g., 'BASE', 'PAPP') to their values (e.g., '12345678', '1250').
     """
-    # Decoding common for Linky: ASCII
-    try:
-        frame_str = raw_frame.decode('ascii').strip()
-        _LOGGER.debug("Successfully decoded TIC frame (%d bytes) to ASCII string (%d chars)", 
-                     len(raw_frame), len(frame_str))
-    except UnicodeDecodeError as e:
-        _LOGGER.error("Failed to decode raw TIC frame using ASCII: %s", e)
-        # Try with error handling to see partial content
-        try:
-            frame_str = raw_frame.decode('ascii', errors='replace').strip()
-            _LOGGER.debug("Partial decode with replacement chars: '%s'", repr(frame_str[:100]))
-        except Exception:
-            pass
-        return {}
+    return dict(iter_tic_frame(raw_frame))
 
-    # Log raw frame for debugging if it's small enough
-    if len(frame_str) < 500:
-        _LOGGER.debug("Raw TIC frame content: %s", repr(frame_str))
-    else:
-        _LOGGER.debug("Raw TIC frame content (first 200 chars): %s...", repr(frame_str[:200]))
-
-    # Split the frame into individual data lines
-    # Data lines are typically separated by CR (0x0D) or LF (0x0A)
-    original_lines = frame_str.replace('\r', '\n').split('\n')
-    lines = [line.strip() for line in original_lines if line.strip()]
+def iter_tic_frame(raw_frame: bytes) -> Iterator[tuple[str, str]]:
+    """
+    Yields the valid (label, value) pairs of a TIC frame (Historic Mode) as they are parsed.
     
-    _LOGGER.debug("Split frame into %d non-empty lines", len(lines))
+    The frame is processed as raw bytes; only the label and value of accepted
+    lines are decoded to str. Frame statistics are logged once the iterator
+    is exhausted.
+
+    Args:
+        raw_frame: The raw bytes received over UDP (a full TIC frame).
+    """
+    frame_size = len(raw_frame)
+    if frame_size < MIN_FRAME_SIZE or frame_size > MAX_FRAME_SIZE:
+        _LOGGER.debug("Ignoring datagram of %d bytes: outside the %d-%d bytes TIC frame range",
+                      frame_size, MIN_FRAME_SIZE, MAX_FRAME_SIZE)
+        return
+
+    # Work on a view of the datagram: line slices below reference the
+    # received buffer instead of copying it
+    frame = memoryview(raw_frame)
+
+    # Diagnostics below copy and repr the frame: only build them when they
+    # will actually be logged
+    debug = _LOGGER.isEnabledFor(logging.DEBUG)
+
+    # Log raw frame for debugging if it's small enough
+    if debug:
+        if frame_size < 500:
+            _LOGGER.debug("Raw TIC frame content: %s", repr(raw_frame))
+        else:
+            _LOGGER.debug("Raw TIC frame content (first 200 bytes): %s...", repr(raw_frame[:200]))
+
+    # Split the frame into individual data lines, kept as (start, end) offsets.
+    # Data lines are typically separated by CR (0x0D) or LF (0x0A), and frames
+    # by STX/ETX; the span pattern skips those without copying.
+    lines = [match.span() for match in _LINE_SPAN.finditer(raw_frame)]
     
-    # Log each line before processing to help identify malformed lines
-    for i, line in enumerate(lines):
-        _LOGGER.debug("Line %d: length=%d, content='%s', last_5_chars='%s'", 
-                     i+1, len(line), line, repr(line[-5:]) if len(line) >= 5 else repr(line))
+    if debug:
+        _LOGGER.debug("Split frame into %d non-empty lines", len(lines))
+        
+        # Log each line before processing to help identify malformed lines
+        for i, (line_start, line_end) in enumerate(lines):
+            _LOGGER.debug("Line %d: length=%d, content=%s", 
+                         i+1, line_end - line_start, repr(raw_frame[line_start:line_end]))
     
-    extracted_data = {}
+    extracted_values = 0
     valid_lines = 0
     invalid_lines = 0
 
-    for i, line in enumerate(lines):
-        if not line:
-            continue
+    # Bind the per-line callables to locals to skip global lookups in the loop
+    match_line = _TIC_LINE.fullmatch
+    match_line_no_checksum = _TIC_LINE_NO_CHECKSUM.fullmatch
+    check_line = validate_checksum
+    canonical_label = _KNOWN_LABELS.get
+
+    for i, (line_start, line_end) in enumerate(lines):
+        line = frame[line_start:line_end]
             
-        _LOGGER.debug("Processing line %d: %s", i+1, repr(line))
-        
         # Check for obviously malformed lines before checksum validation
-        if not line or len(line) < 3:
-            _LOGGER.warning("Skipping malformed line %d: too short (%d chars): '%s'", i+1, len(line), line)
+        if len(line) < 3:
+            _LOGGER.warning("Skipping malformed line %d: too short (%d chars): %s", i+1, len(line), repr(bytes(line)))
             invalid_lines += 1
             continue
             
-        # Check if line ends with multiple spaces (possible transmission issue)
-        if line.endswith('  ') or line.endswith('\t'):
-            _LOGGER.warning("Line %d has suspicious trailing whitespace: '%s' (may be truncated)", i+1, repr(line))
-            
-        # 1. Try to extract Label and Value first (works for both valid and invalid checksums)
-        # Determine data part based on line structure
-        if len(line) >= 3 and line[-2] == ' ':
-            # Standard format: LABEL VALUE CHECKSUM
-            data_part = line[:-2]
+        # 1. A single regex match recognizes well-formed LABEL VALUE CHECKSUM lines
+        match = match_line(raw_frame, line_start, line_end)
+        has_checksum = match is not None
+        if has_checksum:
+            # Validate straight from the buffer: nothing is decoded or copied
+            # for lines that end up rejected
+            checksum_ok = check_line(line)
         else:
             # Malformed line (no checksum): LABEL VALUE
-            data_part = line
+            checksum_ok = False
+            match = match_line_no_checksum(raw_frame, line_start, line_end)
+            if match is None:
+                invalid_lines += 1
+                _LOGGER.warning("Line %d has unexpected format: %s", i+1, repr(bytes(line)))
+                continue
+
+        # The patterns only match ASCII, for which latin-1 is the cheapest
+        # decoder (no range check, never raises)
+        label = match.group(1).decode('latin-1')
+
+        # 2. Only accept PTEC and OPTARIF values without a valid checksum
+        if not checksum_ok:
+            invalid_lines += 1
+            if has_checksum:
+                _log_checksum_failure(bytes(line))
+            if label not in _ACCEPT_WITHOUT_CHECKSUM:
+                if has_checksum:
+                    _LOGGER.warning("Invalid checksum for TIC line %d: %s - rejecting %s value", 
+                                   i+1, repr(bytes(line)), label)
+                else:
+                    _LOGGER.warning("Line %d missing checksum: %s - rejecting %s value", 
+                                   i+1, repr(bytes(line)), label)
+                continue
+        else:
+            valid_lines += 1
+
+        # Lines themselves are not stripped (the checksum may be a space), but
+        # the padding of double-spaced lines is removed from the value
+        value = match.group(2).strip(b' ').decode('latin-1')
             
-        # Split by space. Historic mode uses a single space delimiter.
-        parts = data_part.split(' ', 1)
+        # Clean trailing dots from specific labels that commonly have them
+        if label in _ACCEPT_WITHOUT_CHECKSUM:
+            original_value = value
+            value = value.rstrip('.')
+            if debug and original_value != value:
+                _LOGGER.debug("Cleaned trailing dots from %s: '%s' -> '%s'", 
+                             label, original_value, value)
         
-        if len(parts) == 2:
-            label = parts[0].strip()
-            value = parts[1].strip()
-            
-            # Clean trailing dots from specific labels that commonly have them
-            if label in ('PTEC', 'OPTARIF'):
-                original_value = value
-                value = value.rstrip('.')
-                if original_value != value:
-                    _LOGGER.debug("Cleaned trailing dots from %s: '%s' -> '%s'", 
-                                 label, original_value, value)
-            
-            # Label must be non-empty and non-data start/end delimiters
-            if label and value and label not in ('\x02', '\x03'):
-                # 2. Validate Checksum (only for properly formatted lines)
-                if len(line) >= 3 and line[-2] == ' ':
-                    if not validate_checksum(line):
-                        invalid_lines += 1
-                        # Only accept PTEC and OPTARIF values without valid checksums
-                        if label in ('PTEC', 'OPTARIF'):
-                            _LOGGER.warning("Invalid checksum for TIC line %d: '%s' - but accepting %s value '%s'", 
-                                           i+1, line, label, value)
-                        else:
-                            _LOGGER.warning("Invalid checksum for TIC line %d: '%s' - rejecting %s value", 
-                                           i+1, line, label)
-                            continue
-                    else:
-                        valid_lines += 1
-                else:
-                    # Line without proper checksum format
-                    invalid_lines += 1
-                    # Only accept PTEC and OPTARIF values without checksum format
-                    if label in ('PTEC', 'OPTARIF'):
-                        _LOGGER.warning("Line %d missing checksum: '%s' - but accepting %s value '%s'", 
-                                       i+1, line, label, value)
-                    else:
-                        _LOGGER.warning("Line %d missing checksum: '%s' - rejecting %s value", 
-                                       i+1, line, label)
-                        continue
-                
-                # If we reach here, the value should be extracted
-                extracted_data[label] = value
-                _LOGGER.debug("Successfully extracted: %s = %s", label, value)
-            else:
-                _LOGGER.debug("Skipped line with empty label/value or delimiter: label='%s', value='%s'", 
+        # Label and value must be non-empty
+        if not (label and value):
+            if debug:
+                _LOGGER.debug("Skipped line with empty label/value: label='%s', value='%s'", 
                              label, value)
-        else:
-            invalid_lines += 1
-            _LOGGER.warning("Line %d has unexpected format: '%s' -> parts: %s", 
-                           i+1, line, parts)
+            continue
+
+        if not checksum_ok:
+            if has_checksum:
+                _LOGGER.warning("Invalid checksum for TIC line %d: %s - but accepting %s value '%s'", 
+                               i+1, repr(bytes(line)), label, value)
+            else:
+                _LOGGER.warning("Line %d missing checksum: %s - but accepting %s value '%s'", 
+                               i+1, repr(bytes(line)), label, value)
+        
+        # If we reach here, the value should be extracted. Known labels are
+        # swapped for their interned constant so the sensor platform's dict
+        # lookups match on identity; unknown (possibly noisy) labels are not
+        # interned, which keeps the interpreter's intern table bounded.
+        yield canonical_label(label, label), value
+        extracted_values += 1
+        if debug:
+            _LOGGER.debug("Successfully extracted: %s = %s", label, value)
     
     _LOGGER.info("TIC frame parsing complete: %d valid lines, %d invalid lines, %d extracted values", 
-                valid_lines, invalid_lines, len(extracted_data))
+                valid_lines, invalid_lines, extracted_values)
     
     if invalid_lines > 0:
         _LOGGER.warning("Frame had %d lines with checksum errors out of %d total lines (%.1f%% failure rate)", 
                        invalid_lines, len(lines), (invalid_lines / len(lines)) * 100 if lines else 0)
-    
-    return extracted_data
\ No newline at end of file
@@ -2,21 +2,24 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import logging
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback, Event 
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from . import DOMAIN, EVENT_NEW_TIC_DATA, CONF_PORT
+from . import DOMAIN, EsplinkyListener
 
 _LOGGER = logging.getLogger(__name__)
 
-# Dictionary to map Linky label names to Home Assistant sensor properties (units, icons, etc.)
-LINKY_MAPPING = {
+# Read-only map of Linky label names to Home Assistant sensor properties (units, icons, etc.)
+LINKY_MAPPING: MappingProxyType[str, dict[str, Any]] = MappingProxyType({
     # Consumption (Total Energy) - Configured for Energy Dashboard
     "BASE": {
         "name": "Total Consumption (BASE)", 
@@ -106,10 +109,58 @@ LINKY_MAPPING = {
         "device_class": None, 
         "state_class": None,
     },
+})
+
+def _auto_convert(value: str) -> StateType:
+    """Attempt to convert string value to int/float if possible, otherwise return string."""
+    # Fast path for unsigned counters (the common case): no exception raised.
+    # isdecimal() rather than isdigit(), which also accepts e.g. latin-1 '²'.
+    if value.isdecimal():
+        return int(value)
+    
+    # Without a sign, decimal point or exponent the value cannot be numeric:
+    # return it as is instead of raising and catching two ValueErrors
+    if not any(char in value for char in "+-.eE"):
+        return value
+    
+    try:
+        # TIC energy values are typically large integers
+        return int(value)
+    except ValueError:
+        try:
+            # Handle potential float values
+            return float(value)
+        except ValueError:
+            # Return the cleaned string if conversion fails
+            return value
+
+# Value converter for each known label; unknown labels use _auto_convert
+_CONVERTERS: dict[str, Callable[[str], StateType]] = {
+    "BASE": int,
+    "HCHP": int,
+    "HCHC": int,
+    "IINST": int,
+    "PAPP": int,
+    "PTEC": str,
+    "ADCO": str,
+    "OPTARIF": str,
+    "ISOUSC": int,
+    "IMAX": int,
+    "HHPHC": str,
+    "MOTDETAT": str,
+}
+
+# Settings used for labels missing from LINKY_MAPPING (the name defaults to the label)
+_DEFAULT_META = {
+    "name": None, 
+    "unit": None, 
+    "icon": "mdi:gauge", 
+    "device_class": None, 
+    "state_class": None
 }
 
-# In-memory store for currently tracked sensors
-TRACKED_SENSORS: dict[str, EsplinkySensor] = {}
+# Settings created at runtime for labels missing from LINKY_MAPPING
+_DYNAMIC_MAPPING: dict[str, dict[str, Any]] = {}
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -118,64 +169,73 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     
-    # Store the async_add_entities callback for later use when new sensors appear
-    hass.data[DOMAIN][config_entry.entry_id] = async_add_entities
+    listener: EsplinkyListener = hass.data[DOMAIN][config_entry.entry_id]
+
+    # Sensors tracked for this entry, discarded with it on unload/reload
+    tracked_sensors: dict[str, EsplinkySensor] = {}
 
     @callback
-    def handle_new_data(event: Event) -> None: 
-        """Handle new data event fired by the UDP listener."""
+    def handle_new_data(tic_data: dict[str, str]) -> None: 
+        """Handle new data dispatched by the UDP listener."""
         new_sensors: list[EsplinkySensor] = []
-        
-        # Access the payload via event.data
-        tic_data: dict[str, str] = event.data["data"] 
+        updated_sensors: list[EsplinkySensor] = []
 
         for label, value in tic_data.items():
+            # Update existing sensor with new value (the common case)
+            sensor = tracked_sensors.get(label)
+            if sensor is not None:
+                if sensor.update_state_value(value):
+                    updated_sensors.append(sensor)
+                continue
+
+            meta = LINKY_MAPPING.get(label) or _DYNAMIC_MAPPING.get(label)
             # Dynamically handle truly unknown labels 
-            if label not in LINKY_MAPPING:
+            if meta is None:
                 _LOGGER.warning("Encountered unknown Linky label: %s. Using default settings.", label)
-                # Ensure unknown labels are added to the mapping before sensor creation
-                LINKY_MAPPING[label] = {
-                    "name": label, 
-                    "unit": None, 
-                    "icon": "mdi:gauge", 
-                    "device_class": None, 
-                    "state_class": None
-                }
-
-            # Check if this sensor already exists
-            if label not in TRACKED_SENSORS:
-                _LOGGER.debug("Creating new sensor for Linky label: %s", label)
-                
-                # Create the new sensor entity
-                sensor = EsplinkySensor(config_entry, label, value)
-                TRACKED_SENSORS[label] = sensor
-                new_sensors.append(sensor)
-            else:
-                # Update existing sensor with new value
-                TRACKED_SENSORS[label].update_state_value(value)
+                # Keep the static mapping untouched: unknown labels get their own entry
+                meta = _DYNAMIC_MAPPING[label] = {**_DEFAULT_META, "name": label}
+
+            _LOGGER.debug("Creating new sensor for Linky label: %s", label)
+            
+            # Create the new sensor entity
+            sensor = EsplinkySensor(config_entry, label, value, meta, listener.device_info)
+            tracked_sensors[label] = sensor
+            new_sensors.append(sensor)
+
+        # Write the states of all sensors changed by this frame in one pass
+        for sensor in updated_sensors:
+            sensor.async_write_ha_state()
 
         # Add any newly created sensors to Home Assistant
         if new_sensors:
-            # Check if the async_add_entities callback is still the same object before calling
-            if hass.data[DOMAIN].get(config_entry.entry_id) is async_add_entities:
-                 async_add_entities(new_sensors)
+            async_add_entities(new_sensors)
 
-    # Subscribe to the event fired by __init__.py when new data arrives
+    # Receive parsed data straight from the UDP listener; unregistered on unload
     config_entry.async_on_unload(
-        hass.bus.async_listen(EVENT_NEW_TIC_DATA, handle_new_data)
+        listener.async_register_tic_callback(handle_new_data)
     )
 
 
 class EsplinkySensor(SensorEntity):
     """Representation of a Linky TIC sensor."""
 
-    def __init__(self, config_entry: ConfigEntry, label: str, initial_value: Any) -> None:
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        label: str,
+        initial_value: Any,
+        mapping: dict[str, Any],
+        device_info: DeviceInfo,
+    ) -> None:
         """Initialize the sensor."""
         self._label = label
-        mapping = LINKY_MAPPING[label]
+        # Resolve the value converter once instead of on every update
+        self._convert = _CONVERTERS.get(label, _auto_convert)
         
         self._attr_name = mapping["name"]
         self._attr_unique_id = f"{config_entry.unique_id}_{label}"
+        # Last raw value received, to skip re-sanitizing repeated readings
+        self._last_raw: str = initial_value
         self._attr_native_value = self._sanitize_value(initial_value)
         
         # Apply the required attributes - ensure units are properly set
@@ -189,12 +249,7 @@ class EsplinkySensor(SensorEntity):
         _LOGGER.debug("Creating sensor %s with unit: %s, device_class: %s", 
                      label, unit, mapping["device_class"])
         
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": f"ESPLinky (Port {config_entry.data.get(CONF_PORT)})", 
-            "model": "Linky TIC Listener",
-            "manufacturer": "esplinky",
-        }
+        self._attr_device_info = device_info
 
     @property
     def native_value(self) -> StateType:
@@ -207,28 +262,31 @@ class EsplinkySensor(SensorEntity):
         return self._attr_native_unit_of_measurement
 
     def _sanitize_value(self, value: str) -> StateType:
-        """Attempt to convert string value to int/float if possible, otherwise return string."""
-        
-        cleaned_value = value.strip()
-        
+        """Convert the string value using the converter known for this label."""
+        # No strip() needed: the parser removes the padding of double-spaced
+        # lines from every value
         try:
-            # TIC energy values are typically large integers
-            return int(cleaned_value)
+            return self._convert(value)
         except ValueError:
-            try:
-                # Handle potential float values
-                return float(cleaned_value)
-            except ValueError:
-                # Return the cleaned string if conversion fails (e.g., PTEC, ADCO, etc.)
-                return cleaned_value
+            # Not the expected type (e.g. a garbled numeric value): best effort
+            return _auto_convert(value)
 
     @callback
-    def update_state_value(self, new_value: str) -> None:
-        """Update the sensor's state value and schedule state refresh."""
+    def update_state_value(self, new_value: str) -> bool:
+        """Update the sensor's state value; return True if the state needs to be written."""
+        # Most labels repeat the exact same reading frame after frame
+        if new_value == self._last_raw:
+            return False
+        self._last_raw = new_value
+        
         new_sanitized_value = self._sanitize_value(new_value)
         
         # Only update if the value has actually changed
-        if new_sanitized_value != self._attr_native_value:
-            self._attr_native_value = new_sanitized_value
-            self.async_write_ha_state() 
-            _LOGGER.debug("Sensor %s updated state to: %s", self._label, new_sanitized_value)
\ No newline at end of file
+        if new_sanitized_value == self._attr_native_value:
+            return False
+        self._attr_native_value = new_sanitized_value
+        # Runs for every changed value of every frame: skip the logging call
+        # entirely when debug output is filtered out
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sensor %s updated state to: %s", self._label, new_sanitized_value)
+        return True
\ No newline at end of file